@@ -1,11 +1,14 @@
-from typing import List, Optional, Tuple, TYPE_CHECKING
+import math
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from PySide6.QtWidgets import QGraphicsObject, QGraphicsRectItem, QGraphicsDropShadowEffect
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsRectItem
 from PySide6.QtGui import (
     QColor,
     QPen,
     QBrush,
     QPainter,
+    QPainterPath,
+    QPixmap,
     QLinearGradient,
     QTransform,
 )
@@ -13,25 +16,82 @@ from PySide6.QtCore import (
     Qt,
     QRectF,
     QPointF,
+    QTimer,
+    QPropertyAnimation,
+    QEasingCurve,
     Signal,
 )
 from PySide6.QtSvg import QSvgRenderer
+from constants import (
+    CARD_ASPECT,
+    PLACEHOLDER_BRUSH,
+    PLACEHOLDER_PEN,
+    RANK_INDEX,
+    SELECTION_HALO_PEN,
+    SUIT_INDEX,
+)
 from models import Pile
 
 if TYPE_CHECKING:
     from controller import GameController
 
 
+# Paint objects shared by every card paint / back build
+_WHITE_EDGE_PEN = QPen(QColor(255, 255, 255), 1.5)
+_INNER_PEN = QPen(QColor(255, 255, 255, 180), 2)
+_MOTIF_PEN = QPen(QColor(255, 255, 255, 220), 2)
+_MOTIF_BRUSH = QBrush(QColor(255, 255, 255, 180))
+_BACK_DARK = QColor("#0A1F44")
+_BACK_LIGHT = QColor("#123C8A")
+
+# Pre-baked drop shadow: soft edge width, downward offset, peak alpha and blur spread
+_SHADOW_MARGIN = 16
+_SHADOW_OFFSET_Y = 4
+_SHADOW_MAX_ALPHA = 160
+_SHADOW_SIGMA = 4.0
+
+
+def _shadow_alpha(d: float) -> float:
+    # Opacity (0..1) of a Gaussian-blurred edge at signed distance d outside it
+    return _SHADOW_MAX_ALPHA / 255.0 * 0.5 * math.erfc(d / (_SHADOW_SIGMA * math.sqrt(2)))
+
+
+# Card back motif as a unit diamond, mapped onto the motif rect per size
+_UNIT_DIAMOND = QPainterPath()
+_UNIT_DIAMOND.moveTo(0.5, 0)
+_UNIT_DIAMOND.lineTo(1, 0.5)
+_UNIT_DIAMOND.lineTo(0.5, 1)
+_UNIT_DIAMOND.lineTo(0, 0.5)
+_UNIT_DIAMOND.closeSubpath()
+
+# One parsed renderer per SVG file, shared by every CardItem showing that face
+_SVG_RENDERER_CACHE: Dict[str, QSvgRenderer] = {}
+
+
+def _get_renderer(path: str) -> QSvgRenderer:
+    r = _SVG_RENDERER_CACHE.get(path)
+    if r is None:
+        r = QSvgRenderer(path)
+        _SVG_RENDERER_CACHE[path] = r
+    return r
+
+
+# Diagonal stripe shading for the card back; fades to nothing past x + y = 36
+# in the rotated frame, so only the stripes that start before that are filled
+_STRIPE_GRADIENT = QLinearGradient(0, 0, 18, 18)
+_STRIPE_GRADIENT.setColorAt(0.0, QColor(255, 255, 255, 18))
+_STRIPE_GRADIENT.setColorAt(0.5, QColor(255, 255, 255, 6))
+_STRIPE_GRADIENT.setColorAt(1.0, QColor(255, 255, 255, 0))
+
+
 class PlaceholderItem(QGraphicsRectItem):
     def __init__(self, rect: QRectF):
         super().__init__(rect)
-        from constants import PLACEHOLDER_PEN, PLACEHOLDER_BRUSH, SELECTION_HALO_PEN
         self.setPen(PLACEHOLDER_PEN)
         self.setBrush(PLACEHOLDER_BRUSH)
         self.setZValue(0)
 
     def set_highlighted(self, on: bool):
-        from constants import SELECTION_HALO_PEN, PLACEHOLDER_PEN
         self.setPen(SELECTION_HALO_PEN if on else PLACEHOLDER_PEN)
 
 
@@ -42,61 +102,105 @@ class CardItem(QGraphicsObject):
     # Emitted when a drag finishes: (card, dropScenePos, startPositions)
     dragReleased = Signal(object, QPointF, list)
 
+    # Rasterized card fronts keyed by (suit, rank, width, device pixel ratio);
+    # SVG is rendered once per size at device resolution so faces stay crisp on HiDPI
+    _FRONT_PIXMAP_CACHE: Dict[Tuple[str, str, int, float], QPixmap] = {}
+    # Back design is identical for every card, so it is built once per (w, h)
+    _BACK_CACHE: Dict[Tuple[int, int], QPixmap] = {}
+    # Soft shadow drawn under either face, replaces a per-item QGraphicsEffect
+    _SHADOW_CACHE: Dict[Tuple[int, int], QPixmap] = {}
+
     def __init__(self, suit: str, rank: str, front_svg: str, controller: "GameController", face_up=False):
         super().__init__()
         self.suit = suit
         self.rank = rank
+        # Integer forms of suit/rank/color for cheap rule checks
+        self._suit_idx = SUIT_INDEX[suit]
+        self._rank_idx = RANK_INDEX[rank]
+        self._color_bit = 0 if suit in ("hearts", "diamonds") else 1
+        # Compact 0-51 code for game-state arrays (see Pile.card_ids)
+        self.card_id = self._suit_idx * len(RANK_INDEX) + self._rank_idx
         self.front_svg_path = front_svg
         self.controller = controller
 
         # Rendering
-        self.svg_renderer = QSvgRenderer(self.front_svg_path)
+        self.svg_renderer = _get_renderer(self.front_svg_path)
         # Default size; controller will scale this after view is available
         self.w = 90.0
-        self.h = self.w * 1.45  # CARD_ASPECT
+        self.h = self.w * CARD_ASPECT
 
         # State
         self._face_up = face_up
         self.current_pile: Optional["Pile"] = None
+        self._pile_idx = -1  # position within current_pile, set by Pile.add_cards
         self._dragging = False
         self._drag_group: List[CardItem] = [self]
         self._drag_offset = QPointF(0, 0)
-        self._group_offsets: List[QPointF] = [QPointF(0, 0)]
+        self._group_offsets_xy: List[Tuple[float, float]] = [(0.0, 0.0)]
         self._start_positions: List[QPointF] = []
 
+        # Drag moves are coalesced: only the newest position is applied once per frame
+        self._pending_pos: Optional[QPointF] = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setInterval(16)
+        self._move_timer.timeout.connect(self._apply_pending_move)
+
+        # Reusable 'pos' animation for pile layouts, created on first use
+        self._pos_anim: Optional[QPropertyAnimation] = None
+
         self.setAcceptedMouseButtons(Qt.LeftButton)
         self.setFlag(QGraphicsObject.ItemIsFocusable, True)
         self.setZValue(10)  # cards above placeholders
-
-        # Subtle shadow to lift cards
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(18)
-        shadow.setOffset(0, 4)
-        shadow.setColor(QColor(0, 0, 0, 160))
-        self.setGraphicsEffect(shadow)
-
-        # cached back design recalculated when size changes
-        self._back_cache_size: Tuple[int, int] = (0, 0)
-        self._back_pixmap = None
+        # Keep the painted card as a device pixmap so moves are a blit, not a repaint;
+        # update() in set_face_up/set_size invalidates it
+        self.setCacheMode(QGraphicsObject.DeviceCoordinateCache)
 
     @property
     def color(self) -> str:
-        return "red" if self.suit in ("hearts", "diamonds") else "black"
+        return "red" if self._color_bit == 0 else "black"
 
     def boundingRect(self) -> QRectF:
-        return QRectF(0, 0, self.w, self.h)
+        # Includes the baked shadow around the card body
+        m = _SHADOW_MARGIN
+        return QRectF(-m, -m, self.w + 2 * m, self.h + 2 * m + _SHADOW_OFFSET_Y)
+
+    def shape(self) -> QPainterPath:
+        # Hit-test against the card body only, not its shadow
+        path = QPainterPath()
+        path.addRect(QRectF(0, 0, self.w, self.h))
+        return path
+
+    @classmethod
+    def clear_pixmap_caches(cls):
+        # Drop rasterized pixmaps for sizes that are no longer on screen
+        cls._FRONT_PIXMAP_CACHE.clear()
+        cls._BACK_CACHE.clear()
+        cls._SHADOW_CACHE.clear()
 
     def set_size(self, w: float):
         new_w = max(30.0, min(w, 240.0))
         if abs(new_w - self.w) < 0.1:
             return
         self.prepareGeometryChange()
-        from constants import CARD_ASPECT
         self.w = new_w
         self.h = self.w * CARD_ASPECT
-        self._back_cache_size = (0, 0)  # invalidate
         self.update()
 
+    def pos_animation(self) -> QPropertyAnimation:
+        a = self._pos_anim
+        if a is None:
+            a = QPropertyAnimation(self, b"pos", self)
+            a.setDuration(220)
+            a.setEasingCurve(QEasingCurve.InOutQuad)
+            self._pos_anim = a
+        return a
+
+    def stop_pos_animation(self):
+        # Stop the pooled animation without creating one
+        if self._pos_anim is not None:
+            self._pos_anim.stop()
+
     def is_face_up(self) -> bool:
         return self._face_up
 
@@ -112,26 +216,72 @@ class CardItem(QGraphicsObject):
 
         # Rounded card shape mask
         r = 12.0
-        rect = self.boundingRect()
-        # Draw drop-shadow handled by effect; draw white edge
-        painter.setPen(QPen(QColor(255, 255, 255), 1.5))
+        rect = QRectF(0, 0, self.w, self.h)
+        # Pre-baked drop-shadow under the card, then white edge
+        shadow = self._ensure_shadow_pixmap(int(rect.width()), int(rect.height()))
+        painter.drawPixmap(QPointF(-_SHADOW_MARGIN, -_SHADOW_MARGIN), shadow)
+        painter.setPen(_WHITE_EDGE_PEN)
         painter.setBrush(Qt.NoBrush)
         painter.drawRoundedRect(rect.adjusted(0.75, 0.75, -0.75, -0.75), r, r)
 
         if self._face_up:
-            # Render the SvG front
-            # Many card SvGs have their own backgrounds; scale to rect
-            self.svg_renderer.render(painter, rect.adjusted(2, 2, -2, -2))
+            # Blit the pre-rasterized SvG front
+            device = painter.device()
+            dpr = device.devicePixelRatioF() if device is not None else 1.0
+            pm = self._ensure_front_pixmap(int(rect.width()), int(rect.height()), dpr)
+            painter.drawPixmap(rect.topLeft(), pm)
         else:
             # Programmatic gradient back
             pm = self._ensure_back_pixmap(int(rect.width()), int(rect.height()))
             painter.drawPixmap(rect.topLeft(), pm)
 
-    def _ensure_back_pixmap(self, w: int, h: int):
-        if self._back_pixmap and self._back_cache_size == (w, h):
-            return self._back_pixmap
+    def _ensure_shadow_pixmap(self, w: int, h: int):
+        key = (w, h)
+        pm = CardItem._SHADOW_CACHE.get(key)
+        if pm is not None:
+            return pm
+
+        m = _SHADOW_MARGIN
+        pm = QPixmap(w + 2 * m, h + 2 * m + _SHADOW_OFFSET_Y)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        p.setPen(Qt.NoPen)
+        # Stack shrinking translucent rounded rects; each ring's alpha is chosen so the
+        # composited result follows a blurred edge falling off away from the card
+        body = QRectF(m, m + _SHADOW_OFFSET_Y, w, h)
+        for grow in range(m, -m // 2, -1):
+            outer, inner = _shadow_alpha(grow + 1), _shadow_alpha(grow)
+            a = 1.0 - (1.0 - inner) / (1.0 - outer)
+            p.setBrush(QColor(0, 0, 0, round(a * 255)))
+            r = max(0.0, 12.0 + grow)
+            p.drawRoundedRect(body.adjusted(-grow, -grow, grow, grow), r, r)
+        p.end()
+        CardItem._SHADOW_CACHE[key] = pm
+        return pm
 
-        from PySide6.QtGui import QPixmap, QPainterPath
+    def _ensure_front_pixmap(self, w: int, h: int, dpr: float = 1.0):
+        key = (self.suit, self.rank, w, dpr)
+        pm = CardItem._FRONT_PIXMAP_CACHE.get(key)
+        if pm is not None:
+            return pm
+
+        pm = QPixmap(round(w * dpr), round(h * dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        # Many card SvGs have their own backgrounds; scale to rect
+        self.svg_renderer.render(p, QRectF(0, 0, w, h).adjusted(2, 2, -2, -2))
+        p.end()
+        CardItem._FRONT_PIXMAP_CACHE[key] = pm
+        return pm
+
+    def _ensure_back_pixmap(self, w: int, h: int):
+        key = (w, h)
+        pm = CardItem._BACK_CACHE.get(key)
+        if pm is not None:
+            return pm
 
         pm = QPixmap(w, h)
         pm.fill(Qt.transparent)
@@ -146,46 +296,41 @@ class CardItem(QGraphicsObject):
 
         # Deep royal blue gradient background
         grad = QLinearGradient(0, 0, w, h)
-        grad.setColorAt(0.0, QColor("#0A1F44"))
-        grad.setColorAt(0.5, QColor("#123C8A"))
-        grad.setColorAt(1.0, QColor("#0A1F44"))
+        grad.setColorAt(0.0, _BACK_DARK)
+        grad.setColorAt(0.5, _BACK_LIGHT)
+        grad.setColorAt(1.0, _BACK_DARK)
         p.fillRect(card_rect, grad)
 
         # Subtle diagonal pattern
-        stripe = QLinearGradient(0, 0, 18, 18)
-        stripe.setColorAt(0.0, QColor(255, 255, 255, 18))
-        stripe.setColorAt(0.5, QColor(255, 255, 255, 6))
-        stripe.setColorAt(1.0, QColor(255, 255, 255, 0))
         p.save()
         p.setTransform(QTransform().rotate(35), True)
-        for x in range(-h, w + h, 18):
-            p.fillRect(QRectF(x, -h, 8, h * 3), stripe)
+        stripes = QPainterPath()
+        for x in range(-h, min(w + h, h + 36), 18):
+            stripes.addRect(QRectF(x, -h, 8, h * 3))
+        p.fillPath(stripes, _STRIPE_GRADIENT)
         p.restore()
 
         # Inner border
         inner = card_rect.adjusted(6, 6, -6, -6)
-        p.setPen(QPen(QColor(255, 255, 255, 180), 2))
+        p.setPen(_INNER_PEN)
         p.setBrush(Qt.NoBrush)
         p.drawRoundedRect(inner, rr - 3, rr - 3)
 
         # Center motif: simple diamond
         motif_rect = QRectF(0, 0, w * 0.28, h * 0.18)
         motif_rect.moveCenter(card_rect.center())
-        motif_path = QPainterPath()
-        cx, cy = motif_rect.center().x(), motif_rect.center().y()
-        dx, dy = motif_rect.width() / 2, motif_rect.height() / 2
-        motif_path.moveTo(cx, cy - dy)
-        motif_path.lineTo(cx + dx, cy)
-        motif_path.lineTo(cx, cy + dy)
-        motif_path.lineTo(cx - dx, cy)
-        motif_path.closeSubpath()
-        p.setBrush(QColor(255, 255, 255, 180))
-        p.setPen(QPen(QColor(255, 255, 255, 220), 2))
+        motif_path = (
+            QTransform()
+            .translate(motif_rect.x(), motif_rect.y())
+            .scale(motif_rect.width(), motif_rect.height())
+            .map(_UNIT_DIAMOND)
+        )
+        p.setBrush(_MOTIF_BRUSH)
+        p.setPen(_MOTIF_PEN)
         p.drawPath(motif_path)
 
         p.end()
-        self._back_pixmap = pm
-        self._back_cache_size = (w, h)
+        CardItem._BACK_CACHE[key] = pm
         return pm
 
     # ---------------- Dragging ----------------
@@ -204,7 +349,8 @@ class CardItem(QGraphicsObject):
         self._drag_offset = event.scenePos() - self.pos()
         self._start_positions = [c.pos() for c in group]
         top_pos = self.pos()
-        self._group_offsets = [c.pos() - top_pos for c in group]
+        tx, ty = top_pos.x(), top_pos.y()
+        self._group_offsets_xy = [(c.x() - tx, c.y() - ty) for c in group]
 
         # Bring group to front
         base_z = 1000.0
@@ -224,20 +370,29 @@ class CardItem(QGraphicsObject):
         if not self._dragging:
             return super().mouseMoveEvent(event)
 
-        new_pos = event.scenePos() - self._drag_offset
-        # Move the top (anchor) card
-        self.setPos(new_pos)
-        # Move the rest maintaining offsets
-        for i in range(1, len(self._drag_group)):
-            c = self._drag_group[i]
-            c.setPos(new_pos + self._group_offsets[i])
+        self._pending_pos = event.scenePos()
+        if not self._move_timer.isActive():
+            self._move_timer.start()
         event.accept()
 
+    def _apply_pending_move(self):
+        if not self._dragging or self._pending_pos is None:
+            return
+        nx = self._pending_pos.x() - self._drag_offset.x()
+        ny = self._pending_pos.y() - self._drag_offset.y()
+        self._pending_pos = None
+        # Move the group (anchor card first) maintaining offsets
+        for c, (ox, oy) in zip(self._drag_group, self._group_offsets_xy):
+            c.setPos(nx + ox, ny + oy)
+
     def mouseReleaseEvent(self, event):
         if not self._dragging:
             return super().mouseReleaseEvent(event)
 
         self._dragging = False
+        # Drop any coalesced move; the controller repositions the group itself
+        self._move_timer.stop()
+        self._pending_pos = None
         self.controller.highlight_drop_targets(False)
 
         # Reset visual feedback
@@ -5,6 +5,8 @@ from PySide6.QtCore import Qt
 
 SUITS = ["clubs", "diamonds", "hearts", "spades"]
 RANKS = ["ace"] + [str(n) for n in range(2, 11)] + ["jack", "queen", "king"]
+SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
 
 CARD_ASPECT = 1.45  # height/width
 TOP_MARGIN = 20
@@ -23,3 +25,13 @@ SVG_BASE_DIR = "SVG-cards-1.3"
 def svg_path_for(suit: str, rank: str) -> str:
     # Files like "ace_of_spades.svg", "10_of_hearts.svg"
     return os.path.join(SVG_BASE_DIR, f"{rank}_of_{suit}.svg")
+
+
+# Cards whose SVG asset exists; checked once per process instead of per deal
+AVAILABLE_CARDS = frozenset(
+    (s, r) for s in SUITS for r in RANKS if os.path.exists(svg_path_for(s, r))
+)
+# (suit, rank, svg path) for every available card, in suit/rank order
+CARD_TABLE = tuple(
+    (s, r, svg_path_for(s, r)) for s in SUITS for r in RANKS if (s, r) in AVAILABLE_CARDS
+)
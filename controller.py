@@ -1,11 +1,9 @@
-import os
 import random
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from PySide6.QtWidgets import QGraphicsView, QGraphicsTextItem
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsTextItem
 from PySide6.QtCore import (
     QObject,
-    Signal,
     QPointF,
     QRectF,
     QParallelAnimationGroup,
@@ -14,11 +12,11 @@ from PySide6.QtCore import (
     QEasingCurve,
     Qt,
 )
-from PySide6.QtGui import QPainter, QFont
+from PySide6.QtGui import QFont
 
 from constants import (
     SUITS, RANKS, CARD_ASPECT, TOP_MARGIN, SIDE_MARGIN, PILE_GAP_X, PILE_GAP_Y,
-    svg_path_for
+    AVAILABLE_CARDS, CARD_TABLE, svg_path_for
 )
 from models import Pile
 from card import CardItem, PlaceholderItem
@@ -35,9 +33,15 @@ class GameController(QObject):
         self.window = window
         self.scene = window.game_scene
         self.view = window.game_view
+        # ~60 items that move constantly: a linear scan beats maintaining a BSP tree
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
 
         self.card_width = 100.0
         self.card_height = self.card_width * CARD_ASPECT
+        # Pile grid, refreshed by compute_card_size
+        self._cols_x: Tuple[float, ...] = ()
+        self._y_top = 0.0
+        self._y_tableau = 0.0
 
         self.tableau: List[Pile] = []
         self.foundations: List[Pile] = []
@@ -45,41 +49,19 @@ class GameController(QObject):
         self.waste: Optional[Pile] = None
 
         self.all_piles: List[Pile] = []
+        # Drop-target piles grouped by grid column, for _find_target_pile
+        self._pile_bins: Dict[int, List[Pile]] = {}
+        # Piles that light up while dragging, and whether they currently are
+        self._highlightable_piles: List[Pile] = []
+        self._drop_highlight_on = False
 
         self.deck: List[CardItem] = []  # undealt cards
+        self._card_pool: List[CardItem] = []  # built on first deal, reused by later games
         self._win_animation: Optional[QPropertyAnimation] = None
+        # Single group reused for animated pile layouts; holds pooled card animations
+        self._layout_anim = QParallelAnimationGroup(self)
         self._win_text_item: Optional[QGraphicsTextItem] = None
-        self._wire_view_resize()
-
-    def _wire_view_resize(self):
-        # Recompute layout when the view resizes
-        class _View(self.view.__class__):
-            resized = Signal()
-
-            def resizeEvent(self, ev):
-                super().resizeEvent(ev)
-                self.resized.emit()
-
-        parent_layout = self.window.game_view.parentWidget().layout()
-        idx = parent_layout.indexOf(self.view)
-        old_view = self.view
-        old_view.hide()
-        old_view.setParent(None)
-
-        new_view = _View()
-        new_view.setScene(self.scene)
-        new_view.setFrameStyle(old_view.frameStyle())
-        new_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        new_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        new_view.setStyleSheet("background: transparent;")
-        new_view.setAttribute(Qt.WA_TranslucentBackground)
-        new_view.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        new_view.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
-        new_view.resized.connect(self.relayout_on_resize)
-
-        parent_layout.insertWidget(idx, new_view)
-        self.window.game_view = new_view
-        self.view = new_view
+        self.view.resized.connect(self.relayout_on_resize)
 
     # ---------------- Layout ----------------
 
@@ -89,9 +71,17 @@ class GameController(QObject):
         usable = vw - 2 * SIDE_MARGIN - 6 * PILE_GAP_X
         cw = usable / 7.0
         cw = max(60.0, min(cw, 140.0))
+        if int(cw) != int(self.card_width):
+            # Pixmaps are cached per integer width; old sizes are never reused
+            CardItem.clear_pixmap_caches()
         self.card_width = cw
         self.card_height = self.card_width * CARD_ASPECT
 
+        # Columns X positions and row Y positions shared by setup and relayout
+        self._cols_x = tuple(SIDE_MARGIN + i * (cw + PILE_GAP_X) for i in range(7))
+        self._y_top = TOP_MARGIN + 50  # Some space for top info bar
+        self._y_tableau = self._y_top + self.card_height + 24
+
     def clear_scene(self):
         # Stop win animation and remove text
         if self._win_animation:
@@ -101,15 +91,21 @@ class GameController(QObject):
             self.scene.removeItem(self._win_text_item)
             self._win_text_item = None
 
-        # Remove all items except persistent UI
+        # Remove placeholders and any non-pooled cards; pooled cards stay in the scene
+        pooled = set(self._card_pool)
         for item in list(self.scene.items()):
-            if isinstance(item, (PlaceholderItem, CardItem)):
+            if isinstance(item, PlaceholderItem) or (isinstance(item, CardItem) and item not in pooled):
                 self.scene.removeItem(item)
+        for c in self._card_pool:
+            c.current_pile = None
         self.tableau.clear()
         self.foundations.clear()
         self.stock = None
         self.waste = None
+        self.scene.set_stock_pile(None)
         self.all_piles.clear()
+        self._pile_bins.clear()
+        self._highlightable_piles.clear()
         self.deck.clear()
 
     def setup_piles(self):
@@ -117,10 +113,7 @@ class GameController(QObject):
         cw, ch = self.card_width, self.card_height
         self.scene.setSceneRect(0, 0, max(900, self.view.width()), max(600, self.view.height()))
 
-        # Columns X positions
-        cols_x = [SIDE_MARGIN + i * (cw + PILE_GAP_X) for i in range(7)]
-        y_top = TOP_MARGIN + 50  # Some space for top info bar
-        y_tableau = y_top + ch + 24
+        cols_x, y_top, y_tableau = self._cols_x, self._y_top, self._y_tableau
 
         # Foundations (upper left: 4 piles)
         self.foundations = []
@@ -159,6 +152,17 @@ class GameController(QObject):
             self.tableau.append(Pile("tableau", i, anchor, ph, spacing_y=PILE_GAP_Y))
 
         self.all_piles = [self.stock, self.waste] + self.foundations + self.tableau
+        self.scene.set_stock_pile(self.stock)
+        self._highlightable_piles = [p for p in self.all_piles if p.kind != "stock"]
+        self._drop_highlight_on = False  # fresh placeholders start unhighlighted
+
+        # Columns never change on relayout; only x positions do
+        self._pile_bins = {}
+        for col, p in enumerate(self.foundations):
+            self._pile_bins.setdefault(col, []).append(p)
+        self._pile_bins.setdefault(5, []).append(self.waste)
+        for col, p in enumerate(self.tableau):
+            self._pile_bins.setdefault(col, []).append(p)
 
     def relayout_on_resize(self):
         if not self.tableau:
@@ -169,61 +173,52 @@ class GameController(QObject):
         cw, ch = self.card_width, self.card_height
 
         # Update placeholders and anchors
-        cols_x = [SIDE_MARGIN + i * (cw + PILE_GAP_X) for i in range(7)]
-        y_top = TOP_MARGIN + 50
-        y_tableau = y_top + ch + 24
+        cols_x, y_top, y_tableau = self._cols_x, self._y_top, self._y_tableau
 
         # Update stock/waste/foundations
         for i, f in enumerate(self.foundations):
             f.placeholder.setRect(QRectF(0, 0, cw, ch))
-            f.anchor = QPointF(cols_x[i], y_top)
-            f.placeholder.setPos(f.anchor)
+            f.set_anchor(QPointF(cols_x[i], y_top))
 
         if self.waste:
             self.waste.placeholder.setRect(QRectF(0, 0, cw, ch))
-            self.waste.anchor = QPointF(cols_x[5], y_top)
-            self.waste.placeholder.setPos(self.waste.anchor)
+            self.waste.set_anchor(QPointF(cols_x[5], y_top))
 
         if self.stock:
             self.stock.placeholder.setRect(QRectF(0, 0, cw, ch))
-            self.stock.anchor = QPointF(cols_x[6], y_top)
-            self.stock.placeholder.setPos(self.stock.anchor)
+            self.stock.set_anchor(QPointF(cols_x[6], y_top))
 
         for i, t in enumerate(self.tableau):
             t.placeholder.setRect(QRectF(0, 0, cw, ch))
-            t.anchor = QPointF(cols_x[i], y_tableau)
-            t.placeholder.setPos(t.anchor)
+            t.set_anchor(QPointF(cols_x[i], y_tableau))
 
         # Scale cards and re-layout
-        for item in self.scene.items():
-            if isinstance(item, CardItem):
-                item.set_size(cw)
+        for p in self.all_piles:
+            for c in p.cards:
+                c.set_size(cw)
 
         # Instant reflow for accurate UI
-        anim = QParallelAnimationGroup()
-        for p in self.all_piles:
-            p.layout_cards(animate=False, anim_group=None)
+        self._animate_layout(self.all_piles)
 
     # ---------------- Deck & Deal ----------------
 
     def build_deck(self):
         self.deck.clear()
-        print("DEBUG: Building deck...")
-        for s in SUITS:
-            for r in RANKS:
-                path = svg_path_for(s, r)
-                if not os.path.exists(path):
-                    # Skip missing assets defensively
-                    continue
-                c = CardItem(s, r, path, self, face_up=False)
-                c.set_size(self.card_width)
-                c.setPos(self.stock.anchor)  # start at stock for deal animation origin
+        if not self._card_pool:
+            # Missing assets are already skipped in CARD_TABLE
+            self._card_pool = [CardItem(s, r, path, self, face_up=False) for s, r, path in CARD_TABLE]
+            for c in self._card_pool:
                 c.dragReleased.connect(self.on_card_drag_released)
                 self.scene.addItem(c)
-                self.deck.append(c)
 
-        random.shuffle(self.deck)
-        print(f"DEBUG: Deck built with {len(self.deck)} cards.")
+        # Shuffled order in one call
+        pool = self._card_pool
+        self.deck = [pool[i] for i in random.sample(range(len(pool)), len(pool))]
+        for c in self.deck:
+            c.set_face_up(False)
+            c.setOpacity(1.0)
+            c.set_size(self.card_width)
+            c.setPos(self.stock.anchor)  # start at stock for deal animation origin
 
     def deal(self):
         """
@@ -236,7 +231,7 @@ class GameController(QObject):
         for c in self.deck:
             c.setPos(self.stock.anchor)
 
-        anim = QParallelAnimationGroup()
+        anim = self._reset_layout_animation()
 
         # Deal to tableau
         idx = 0
@@ -264,11 +259,7 @@ class GameController(QObject):
                 card.current_pile = self.stock
         self.stock.layout_cards(animate=True, anim_group=anim)
 
-        anim.start(QParallelAnimationGroup.DeleteWhenStopped)
-        print("DEBUG: Deal finished.")
-        # Log pile counts
-        for p in self.all_piles:
-            print(f"DEBUG: Pile {p.kind} {p.index} has {len(p.cards)} cards.")
+        anim.start()
 
 
 
@@ -276,23 +267,20 @@ class GameController(QObject):
 
     def new_game(self):
         # Clear scene, piles, build deck, deal
-        print("\nDEBUG: ====================")
-        print("DEBUG: Starting new game...")
-        print("DEBUG: ====================")
         self.clear_scene()
         self.won = False
         self.setup_piles()
         self.build_deck()
         self.deal()
-        print("DEBUG: New game setup complete.")
 
     def highlight_drop_targets(self, on: bool):
         # Phase 1: allow drops to any pile except stock; foundations accept only single card visually
-        for p in self.all_piles:
-            if p.kind == "stock":
-                p.placeholder.set_highlighted(False)
-            else:
-                p.placeholder.set_highlighted(on)
+        # Stock is never highlighted, so only the other piles need touching
+        if on == self._drop_highlight_on:
+            return
+        self._drop_highlight_on = on
+        for p in self._highlightable_piles:
+            p.placeholder.set_highlighted(on)
 
     def get_draggable_group_for(self, card: CardItem) -> List[CardItem]:
         """
@@ -306,7 +294,7 @@ class GameController(QObject):
             return []
 
         if pile.kind == "waste":
-            if card is pile.top_card():
+            if card is pile._top:
                 return [card]
             return []
 
@@ -314,21 +302,19 @@ class GameController(QObject):
             # Build group from this card to top, only if this card is face-up and sequence is valid
             if not card.is_face_up():
                 return []
-            idx = pile.cards.index(card)
+            idx = pile.index_of(card)
             group = [card]
-            for i in range(idx + 1, len(pile.cards)):
-                top = group[-1]
-                bottom = pile.cards[i]
+            prev = card
+            for bottom in pile.cards[idx + 1:]:
                 # Tableau stack rule: next card must be one rank lower and opposite color
-                if bottom.color == top.color:
-                    return [] # invalid group
-                if RANKS.index(bottom.rank) != RANKS.index(top.rank) - 1:
+                if bottom._color_bit == prev._color_bit or bottom._rank_idx != prev._rank_idx - 1:
                     return [] # invalid group
                 group.append(bottom)
+                prev = bottom
             return group
 
         if pile.kind == "foundation":
-            if card is pile.top_card():
+            if card is pile._top:
                 return [card]
             return []
 
@@ -345,20 +331,20 @@ class GameController(QObject):
             if not top_pile.cards:
                 return bottom_card.rank == "king"
             else:
-                top_card = top_pile.top_card()
+                top_card = top_pile._top
                 if not top_card: return False
-                return (bottom_card.color != top_card.color and
-                        RANKS.index(bottom_card.rank) == RANKS.index(top_card.rank) - 1)
+                return (bottom_card._color_bit != top_card._color_bit and
+                        bottom_card._rank_idx == top_card._rank_idx - 1)
 
         if top_pile.kind == "foundation":
             # Foundation: empty accepts Ace; otherwise same suit, rank+1
             if not top_pile.cards:
                 return bottom_card.rank == "ace"
             else:
-                top_card = top_pile.top_card()
+                top_card = top_pile._top
                 if not top_card: return False
-                return (bottom_card.suit == top_card.suit and
-                        RANKS.index(bottom_card.rank) == RANKS.index(top_card.rank) + 1)
+                return (bottom_card._suit_idx == top_card._suit_idx and
+                        bottom_card._rank_idx == top_card._rank_idx + 1)
         return False
 
     def on_card_drag_released(self, card: CardItem, scene_pos: QPointF, start_positions: List[QPointF]):
@@ -389,21 +375,21 @@ class GameController(QObject):
             # Accept drop
             target.add_cards(old_group)
             self._animate_layout([src_pile, target])
-            print(f"DEBUG: Accepted drop to {target.kind}, calling check_win")
             self.check_win()
             # Auto-flip new top card of a tableau if it was face-down
-            if src_pile.kind == "tableau" and src_pile.top_card() and not src_pile.top_card().is_face_up():
-                src_pile.top_card().set_face_up(True)
+            new_top = src_pile._top
+            if src_pile.kind == "tableau" and new_top and not new_top.is_face_up():
+                new_top.set_face_up(True)
         else:
             # Revert
             self._animate_revert(group, start_positions)
 
 
     def _find_target_pile(self, pt: QPointF, prefer_tableau=True) -> Optional[Pile]:
+        # Only the piles in the column under the point can contain it
+        col = int((pt.x() - SIDE_MARGIN) // (self.card_width + PILE_GAP_X))
         candidates = []
-        for p in self.all_piles:
-            if p.kind == "stock":
-                continue
+        for p in self._pile_bins.get(col, ()):
             if p.kind == "tableau":
                 # Expanded drop zone for tableau: covers full stack height
                 x = p.anchor.x()
@@ -418,7 +404,7 @@ class GameController(QObject):
                     candidates.append(p)
             else:
                 # Foundation/waste: standard placeholder rect
-                if p.placeholder.sceneBoundingRect().contains(pt):
+                if p.contains_point(pt):
                     candidates.append(p)
         if not candidates:
             return None
@@ -429,6 +415,15 @@ class GameController(QObject):
                     return p
         return candidates[0]
 
+    def _reset_layout_animation(self) -> QParallelAnimationGroup:
+        # Take pooled animations back out so the group can be refilled without deleting
+        # them; their owners (cards, pile animators) keep the references
+        group = self._layout_anim
+        group.stop()
+        while group.animationCount():
+            group.takeAnimation(0)
+        return group
+
     def _animate_layout(self, piles: List[Pile]):
         for p in piles:
             p.layout_cards(animate=False, anim_group=None)
@@ -441,9 +436,7 @@ class GameController(QObject):
     def check_win(self):
         if self.won:
             return
-        print(f"DEBUG: Check win, foundations: {[len(f.cards) for f in self.foundations]}")
         if all(len(f.cards) == 13 for f in self.foundations):
-            print("DEBUG: Win condition met!")
             self.won = True
             self.show_celebration()
 
@@ -501,18 +494,16 @@ class GameController(QObject):
         if not self.stock or not self.stock.cards:
             # If stock empty, recycle waste back to stock face-down (Phase 1 UX)
             if self.waste and self.waste.cards:
-                moving = list(reversed(self.waste.cards))
-                self.waste.cards.clear()
+                moving = self.waste.remove_cards_from_index(0)
+                moving.reverse()
                 for c in moving:
                     c.set_face_up(False)
-                    c.current_pile = self.stock
                 self.stock.add_cards(moving)
                 self._animate_layout([self.stock, self.waste])
                 self.check_win()
             return
 
-        card = self.stock.cards.pop()  # take top visually
-        card.current_pile = self.waste
+        card = self.stock.remove_cards_from_index(len(self.stock.cards) - 1)[0]  # take top visually
         # Move to waste
         self.waste.add_cards([card])
         card.set_face_up(True)
@@ -526,10 +517,9 @@ class GameController(QObject):
             suit = suits[i]
             # Cards from ace to king
             for r in RANKS:
-                path = svg_path_for(suit, r)
-                if not os.path.exists(path):
+                if (suit, r) not in AVAILABLE_CARDS:
                     continue
-                c = CardItem(suit, r, path, self, face_up=True)
+                c = CardItem(suit, r, svg_path_for(suit, r), self, face_up=True)
                 c.set_size(self.card_width)
                 c.current_pile = f
                 f.add_cards([c])
@@ -1,12 +1,74 @@
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, TYPE_CHECKING
-from PySide6.QtCore import QPointF, QRectF, QPropertyAnimation, QEasingCurve
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from PySide6.QtCore import QPointF, QRectF, QAbstractAnimation, QVariantAnimation, QEasingCurve
 
 if TYPE_CHECKING:
     from card import CardItem, PlaceholderItem
     from PySide6.QtCore import QParallelAnimationGroup
 
 
+# Piles with more cards than this animate through one shared driver, not one animation per card
+_BULK_ANIM_THRESHOLD = 8
+
+
+class _PileAnimator:
+    """
+    Queues a pile's card animations toward their stacked positions.
+    Small piles use each card's pooled 'pos' animation; larger ones share one reusable
+    QVariantAnimation so each frame is a single callback instead of one per card.
+    """
+
+    def __init__(self):
+        self._bulk: Optional[QVariantAnimation] = None
+        self._bulk_cards: List["CardItem"] = []
+        self._bulk_starts: List[Tuple[float, float]] = []
+        self._bulk_targets: Tuple[Tuple[float, float], ...] = ()
+
+    def animate_to_positions(self, cards: List["CardItem"], targets: Tuple[Tuple[float, float], ...],
+                             group: "QParallelAnimationGroup"):
+        if len(cards) > _BULK_ANIM_THRESHOLD:
+            self._animate_bulk(cards, targets, group)
+            return
+
+        for c, (x, y) in zip(cards, targets):
+            # Pooled per-card animation; start value stays unset so it runs from the current pos
+            a = c.pos_animation()
+            a.stop()
+            a.setEndValue(QPointF(x, y))
+            group.addAnimation(a)
+
+    def _animate_bulk(self, cards: List["CardItem"], targets: Tuple[Tuple[float, float], ...],
+                      group: "QParallelAnimationGroup"):
+        a = self._bulk
+        if a is None:
+            a = QVariantAnimation()
+            a.setDuration(220)
+            a.setEasingCurve(QEasingCurve.InOutQuad)
+            a.setStartValue(0.0)
+            a.setEndValue(1.0)
+            a.stateChanged.connect(self._on_bulk_state_changed)
+            a.valueChanged.connect(self._on_bulk_value)
+            self._bulk = a
+        a.stop()
+        # Per-card animations from an earlier layout would fight the shared driver
+        for c in cards:
+            c.stop_pos_animation()
+        self._bulk_cards = list(cards)
+        self._bulk_starts = []
+        self._bulk_targets = targets
+        group.addAnimation(a)
+
+    def _on_bulk_state_changed(self, new_state, old_state):
+        if new_state == QAbstractAnimation.Running:
+            # Start from wherever the cards are when the group actually runs
+            self._bulk_starts = [(c.x(), c.y()) for c in self._bulk_cards]
+
+    def _on_bulk_value(self, t):
+        for c, (sx, sy), (ex, ey) in zip(self._bulk_cards, self._bulk_starts, self._bulk_targets):
+            c.setPos(sx + (ex - sx) * t, sy + (ey - sy) * t)
+
+
 @dataclass
 class Pile:
     kind: str  # "tableau" | "foundation" | "stock" | "waste"
@@ -20,46 +82,89 @@ class Pile:
     def __post_init__(self):
         if self.cards is None:
             self.cards = []
+        # Card codes parallel to self.cards, so rule/hint scans need not touch the items
+        self.card_ids = array("B", (c.card_id for c in self.cards))
+        # Top card, kept current by add_cards/remove_cards_from_index for hot-path reads
+        self._top: Optional["CardItem"] = self.cards[-1] if self.cards else None
+        self._refresh_bounds()
+        self._animator = _PileAnimator()
+
+    def _refresh_bounds(self):
+        # Scalar scene bounds of the placeholder for contains_point
+        r = self.rect()
+        self._x0, self._y0, self._x1, self._y1 = r.left(), r.top(), r.right(), r.bottom()
+
+    def set_anchor(self, anchor: QPointF):
+        # Call after any placeholder.setRect so the cached bounds pick up the new size
+        self.anchor = anchor
+        self.placeholder.setPos(anchor)
+        self._refresh_bounds()
 
     def rect(self) -> QRectF:
         return self.placeholder.rect().translated(self.anchor)
 
     def add_cards(self, cards: List["CardItem"]):
-        for c in cards:
-            self.cards.append(c)
+        start = len(self.cards)
+        self.cards.extend(cards)
+        self.card_ids.extend(c.card_id for c in cards)
+        if cards:
+            self._top = cards[-1]
+        for i, c in enumerate(cards, start):
             c.current_pile = self
+            c._pile_idx = i
+
+    def index_of(self, card: "CardItem") -> int:
+        # Use the index stored by add_cards; fall back to a scan if the list was edited directly
+        idx = card._pile_idx
+        if 0 <= idx < len(self.cards) and self.cards[idx] is card:
+            return idx
+        try:
+            return self.cards.index(card)
+        except ValueError:
+            return -1
 
     def remove_cards_from(self, card: "CardItem") -> List["CardItem"]:
         # Remove 'card' and everything above it in this pile
-        if card not in self.cards:
+        idx = self.index_of(card)
+        if idx < 0:
             return []
-        idx = self.cards.index(card)
+        return self.remove_cards_from_index(idx)
+
+    def remove_cards_from_index(self, idx: int) -> List["CardItem"]:
         group = self.cards[idx:]
-        self.cards = self.cards[:idx]
+        del self.cards[idx:]
+        del self.card_ids[idx:]
+        self._top = self.cards[-1] if self.cards else None
         for c in group:
             c.current_pile = None
         return group
 
     def top_card(self) -> Optional["CardItem"]:
-        return self.cards[-1] if self.cards else None
+        return self._top
+
+    def top_card_id(self) -> int:
+        # 255 when empty; real codes are 0-51
+        return self.card_ids[-1] if self.card_ids else 255
 
     def layout_cards(self, animate=False, anim_group: Optional["QParallelAnimationGroup"] = None):
-        # Position cards starting from anchor; tableau uses spacing_y
-        for i, c in enumerate(self.cards):
-            target = self.anchor + QPointF(0, i * self.spacing_y)
-            if animate and anim_group is not None:
-                a = QPropertyAnimation(c, b"pos")
-                a.setDuration(220)
-                a.setEasingCurve(QEasingCurve.InOutQuad)
-                a.setEndValue(target)
-                anim_group.addAnimation(a)
-            else:
-                c.setPos(target)
-
-        # Update z ordering within pile
+        # Position cards starting from anchor; tableau uses spacing_y.
+        # Z ordering within the pile is updated alongside.
         base = 50 + self.index * 10
-        for i, c in enumerate(self.cards):
+        ax, ay, sy = self.anchor.x(), self.anchor.y(), self.spacing_y
+        targets = tuple((ax, ay + i * sy) for i in range(len(self.cards)))
+        if animate and anim_group is not None:
+            self._animator.animate_to_positions(self.cards, targets, anim_group)
+            for i, c in enumerate(self.cards):
+                c.setZValue(base + i)
+            return
+
+        for i, (c, (x, y)) in enumerate(zip(self.cards, targets)):
+            c.setPos(x, y)
             c.setZValue(base + i)
 
     def contains_point(self, p: QPointF) -> bool:
-        return self.rect().contains(p)
+        px = p.x()
+        if px < self._x0 or px > self._x1:
+            return False
+        py = p.y()
+        return self._y0 <= py <= self._y1
@@ -1,3 +1,5 @@
+from typing import Dict, Optional, TYPE_CHECKING
+
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -12,15 +14,75 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import (
     QColor,
     QPalette,
-    QPen,
+    QPainter,
     QIcon,
 )
 from PySide6.QtCore import (
     Qt,
-    QPointF,
+    Signal,
 )
 
-from constants import PLACEHOLDER_PEN, PLACEHOLDER_BRUSH, SELECTION_HALO_PEN
+if TYPE_CHECKING:
+    from models import Pile
+
+
+_LABEL_QSS = "QLabel { color: white; font-size: 18px; }"
+
+_BUTTON_QSS = """
+QPushButton {
+    background-color: rgba(255, 255, 255, 0.12);
+    color: white;
+    font-size: 16px;
+    padding: 16px;
+    border: 1px solid rgba(255, 255, 255, 0.3);
+    border-radius: 8px;
+    icon-size: 32px;
+    min-width: 64px;
+    min-height: 64px;
+}
+QPushButton:hover {
+    background-color: rgba(255, 255, 255, 0.2);
+    border-color: rgba(255, 255, 255, 0.5);
+}
+QPushButton:pressed {
+    background-color: rgba(255, 255, 255, 0.3);
+    border-color: rgba(255, 255, 255, 0.7);
+}
+"""
+
+# Themed standard icons, rasterized once per process
+_ICON_CACHE: Dict[QStyle.StandardPixmap, QIcon] = {}
+
+
+class GameView(QGraphicsView):
+    """Graphics view that announces resizes so the controller can relayout."""
+    resized = Signal()
+
+    def resizeEvent(self, ev):
+        super().resizeEvent(ev)
+        self.resized.emit()
+
+
+class GameScene(QGraphicsScene):
+    """Scene that turns presses on the stock pile into stockClicked before item handling."""
+    stockClicked = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Bound once per game; the pile keeps its own hit bounds current on relayout
+        self._stock_pile: Optional["Pile"] = None
+
+    def set_stock_pile(self, pile: Optional["Pile"]):
+        self._stock_pile = pile
+
+    def mousePressEvent(self, event):
+        stock = self._stock_pile
+        if stock is not None and stock.contains_point(event.scenePos()):
+            self.stockClicked.emit()
+            event.accept()
+            return
+        # Otherwise, default handling (will bubble to items for drag)
+        super().mousePressEvent(event)
 
 
 class SolitaireWindow(QMainWindow):
@@ -46,13 +108,21 @@ class SolitaireWindow(QMainWindow):
         self._create_top_bar(main_layout)
 
         # Game view and scene
-        self.game_view = QGraphicsView()
-        self.game_scene = QGraphicsScene()
+        self.game_view = GameView()
+        self.game_scene = GameScene()
         self.game_view.setScene(self.game_scene)
         self.game_view.setFrameStyle(QGraphicsView.NoFrame)
         self.game_view.setStyleSheet("background: transparent;")
+        self.game_view.setAttribute(Qt.WA_TranslucentBackground)
         self.game_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.game_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        # Cards antialias their own rounded edge in paint(); placeholders are plain rects
+        self.game_view.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        self.game_view.setCacheMode(QGraphicsView.CacheBackground)
+        self.game_view.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        # Items set their own pen/brush and stay within their bounding rects
+        self.game_view.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+        self.game_view.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
         main_layout.addWidget(self.game_view, 1)
 
         # Controller (needs to be before bottom bar for button connections)
@@ -63,8 +133,8 @@ class SolitaireWindow(QMainWindow):
         # Bottom bar
         self._create_bottom_bar(main_layout)
 
-        # Clickable stock area: intercept mouse presses on scene
-        self.game_scene.mousePressEvent = self._scene_mouse_press_wrapper(self.game_scene.mousePressEvent)
+        # Clickable stock area
+        self.game_scene.stockClicked.connect(self.controller.on_stock_clicked)
 
     def showEvent(self, event):
         super().showEvent(event)
@@ -76,15 +146,12 @@ class SolitaireWindow(QMainWindow):
         top_bar_widget = QWidget()
         top_bar_layout = QHBoxLayout(top_bar_widget)
         top_bar_layout.setContentsMargins(0, 0, 0, 0)
-
-        label_style = "QLabel { color: white; font-size: 18px; }"
+        # One stylesheet on the bar; its QLabel rule cascades to every label
+        top_bar_widget.setStyleSheet(_LABEL_QSS)
 
         self.time_label = QLabel("Time: 00:00")
-        self.time_label.setStyleSheet(label_style)
         self.score_label = QLabel("Score: 0")
-        self.score_label.setStyleSheet(label_style)
         self.moves_label = QLabel("Moves: 0")
-        self.moves_label.setStyleSheet(label_style)
 
         top_bar_layout.addWidget(self.time_label)
         top_bar_layout.addStretch()
@@ -94,34 +161,19 @@ class SolitaireWindow(QMainWindow):
 
         parent_layout.addWidget(top_bar_widget)
 
+    def _icon(self, sp: QStyle.StandardPixmap) -> QIcon:
+        icon = _ICON_CACHE.get(sp)
+        if icon is None:
+            icon = self.style().standardIcon(sp)
+            _ICON_CACHE[sp] = icon
+        return icon
+
     def _create_bottom_bar(self, parent_layout):
         bottom_bar_widget = QWidget()
         bottom_bar_layout = QHBoxLayout(bottom_bar_widget)
         bottom_bar_layout.setContentsMargins(0, 0, 0, 0)
         bottom_bar_layout.setSpacing(10)
 
-        button_style = """
-            QPushButton {
-                background-color: rgba(255, 255, 255, 0.12);
-                color: white;
-                font-size: 16px;
-                padding: 16px;
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 8px;
-                icon-size: 32px;
-                min-width: 64px;
-                min-height: 64px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.2);
-                border-color: rgba(255, 255, 255, 0.5);
-            }
-            QPushButton:pressed {
-                background-color: rgba(255, 255, 255, 0.3);
-                border-color: rgba(255, 255, 255, 0.7);
-            }
-        """
-
         undo_button = QPushButton()
         hint_button = QPushButton()
         shuffle_button = QPushButton()
@@ -129,21 +181,21 @@ class SolitaireWindow(QMainWindow):
         settings_button = QPushButton()
         play_button = QPushButton()
 
-        for b in [undo_button, hint_button, shuffle_button, daily_button, settings_button, play_button]:
-            b.setStyleSheet(button_style)
+        # One stylesheet on the bar; its QPushButton rules cascade to every button
+        bottom_bar_widget.setStyleSheet(_BUTTON_QSS)
 
         # Add icons from Qt standard pixmaps and tooltips
-        undo_button.setIcon(self.style().standardIcon(QStyle.SP_ArrowBack))
+        undo_button.setIcon(self._icon(QStyle.SP_ArrowBack))
         undo_button.setToolTip("Undo")
-        hint_button.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxQuestion))
+        hint_button.setIcon(self._icon(QStyle.SP_MessageBoxQuestion))
         hint_button.setToolTip("Hint")
-        shuffle_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        shuffle_button.setIcon(self._icon(QStyle.SP_BrowserReload))
         shuffle_button.setToolTip("Shuffle")
-        daily_button.setIcon(self.style().standardIcon(QStyle.SP_FileLinkIcon))
+        daily_button.setIcon(self._icon(QStyle.SP_FileLinkIcon))
         daily_button.setToolTip("Daily")
-        settings_button.setIcon(self.style().standardIcon(QStyle.SP_CommandLink))
+        settings_button.setIcon(self._icon(QStyle.SP_CommandLink))
         settings_button.setToolTip("Debug: Force Win")
-        play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
+        play_button.setIcon(self._icon(QStyle.SP_MediaPlay))
         play_button.setToolTip("Play")
 
         bottom_bar_layout.addWidget(undo_button)
@@ -164,14 +216,3 @@ class SolitaireWindow(QMainWindow):
         hint_button.clicked.connect(lambda: None)
         daily_button.clicked.connect(lambda: None)
         settings_button.clicked.connect(self.controller.on_force_win_clicked)
-
-    def _scene_mouse_press_wrapper(self, original_handler):
-        # Wrap the scene's mousePressEvent to detect clicks on stock placeholder
-        def handler(event):
-            if self.controller.stock and self.controller.stock.placeholder.sceneBoundingRect().contains(event.scenePos()):
-                self.controller.on_stock_clicked()
-                event.accept()
-                return
-            # Otherwise, default handling (will bubble to items for drag)
-            return original_handler(event)
-        return handler